@@ -0,0 +1,29 @@
+#
+# Copyright (c) 2024 Joshua Watt
+#
+# SPDX-License-Identifier: MIT
+
+import re
+
+# Matches trailing whitespace anywhere in a file
+TRAILING_WHITESPACE = re.compile(r"[^\S\n]+$", re.MULTILINE)
+
+# Matches tabs or trailing whitespace anywhere in a file
+BAD_WHITESPACE = re.compile(r"\t|[^\S\n]+$", re.MULTILINE)
+
+
+def check_whitespace(text, *, allow_tabs=False, name=None):
+    """
+    Asserts that text does not have any trailing whitespace, or any tabs
+    unless allow_tabs is True. If provided, name is used to identify the text
+    in the failure message
+    """
+    regex = TRAILING_WHITESPACE if allow_tabs else BAD_WHITESPACE
+    m = regex.search(text)
+    if m is None:
+        return
+
+    lineno = text.count("\n", 0, m.start()) + 1
+    line = text.split("\n")[lineno - 1]
+    prefix = f"{name}: " if name is not None else ""
+    assert False, f"{prefix}Line {lineno} has trailing whitespace or tabs: {line!r}"
@@ -3,9 +3,13 @@
 #
 # SPDX-License-Identifier: MIT
 
+import itertools
 import json
+import os
 import pytest
 import re
+import shlex
+import shutil
 import subprocess
 import textwrap
 import multiprocessing
@@ -13,6 +17,7 @@ from pathlib import Path
 from enum import Enum
 from dataclasses import dataclass
 import jsonvalidation
+from whitespace import check_whitespace
 
 THIS_FILE = Path(__file__)
 THIS_DIR = THIS_FILE.parent
@@ -27,12 +32,20 @@ TEST_CONTEXT = THIS_DIR / "data" / "model" / "test-context.json"
 SPDX3_CONTEXT_URL = "https://spdx.github.io/spdx-3-model/context.json"
 
 
+def make_jobs():
+    # When running under pytest-xdist, each worker may be building at the
+    # same time, so divide the CPUs between them
+    workers = int(os.environ.get("PYTEST_XDIST_WORKER_COUNT", "1"))
+    return max(1, multiprocessing.cpu_count() // workers)
+
+
 @dataclass
 class Lib:
     basename: str
     rpath: Path
     bindir: Path
-    pkg_config: Path
+    cflags: list
+    libs: list
     namespace: str
     directory: Path
 
@@ -59,20 +72,23 @@ def build_lib(tmp_path_factory, model_server, tmpname, *, namespace=None):
         ]
         + extra_args,
         check=True,
+        stdin=subprocess.DEVNULL,
     )
     subprocess.run(
         [
             "make",
-            "-j" + str(multiprocessing.cpu_count()),
+            "-j" + str(make_jobs()),
             "CXXFLAGS=-Wall -Werror -g -save-temps",
         ],
         check=True,
         cwd=tmp_directory,
+        stdin=subprocess.DEVNULL,
     )
     subprocess.run(
         ["make", "install", "PREFIX=" + str(install_dir)],
         check=True,
         cwd=tmp_directory,
+        stdin=subprocess.DEVNULL,
     )
     pkg_config = tmp_directory / "pkg-config"
     pkg_config.write_text(
@@ -86,11 +102,24 @@ def build_lib(tmp_path_factory, model_server, tmpname, *, namespace=None):
     )
     pkg_config.chmod(0o755)
 
+    # Resolve the compiler flags once so that each test program can invoke
+    # the compiler directly instead of going through a shell
+    def pkg_config_flags(arg):
+        p = subprocess.run(
+            [pkg_config, arg, basename],
+            check=True,
+            stdout=subprocess.PIPE,
+            encoding="utf-8",
+            stdin=subprocess.DEVNULL,
+        )
+        return shlex.split(p.stdout)
+
     return Lib(
         basename=basename,
         rpath=install_dir / "lib",
         bindir=install_dir / "bin",
-        pkg_config=pkg_config,
+        cflags=pkg_config_flags("--cflags"),
+        libs=pkg_config_flags("--libs"),
         namespace=(
             re.sub(r"[^a-zA-Z0-9_]", "_", basename) if namespace is None else namespace
         ),
@@ -111,112 +140,203 @@ class Progress(Enum):
     RUNS = 4
 
 
-@pytest.fixture
-def compile_test(test_lib, tmp_path):
-    def f(code_fragment, *, progress=Progress.RUNS, static=False):
-        src = tmp_path / "test.cpp"
-        src.write_text(
-            textwrap.dedent(
-                f"""\
-                #include "{test_lib.basename}/{test_lib.basename}.hpp"
-                #include "{test_lib.basename}/{test_lib.basename}-jsonld.hpp"
-                #include <iostream>
-                #include <fstream>
-                #include <iomanip>
-
-                using namespace {test_lib.namespace};
-
-                int main(int argc, char** argv) {{
-                    try {{
-                """
-            )
-            + textwrap.dedent(code_fragment)
-            + "".join(
-                textwrap.dedent(
-                    f"""\
-                    }} catch ({exc}& e) {{
-                        std::cout << " {enum.name} " << e.what() << std::endl;
-                        return 1;
-                    """
-                )
-                for exc, enum in (
-                    ("ValidationError", Progress.VALIDATION_FAILS),
-                    ("std::bad_cast", Progress.CAST_FAILS),
-                )
-            )
-            + textwrap.dedent(
-                """\
-                    }
-                    return 0;
-                }
-                """
-            )
+# The start of a test program, after the includes
+TEST_PROGRAM_HEADER = textwrap.dedent(
+    """\
+
+    using namespace {namespace};
+    """
+)
+
+# The end of a test program. Runs the test function selected by the first
+# argument
+TEST_PROGRAM_FOOTER = textwrap.dedent(
+    """\
+
+    int main(int argc, char** argv) {{
+        static int (*const tests[])() = {{
+            {tests}
+        }};
+        return tests[argc > 1 ? std::stoul(argv[1]) : 0]();
+    }}
+    """
+)
+
+# The boilerplate wrapped around each code fragment in a test program. Any
+# exception that indicates an expected failure is caught and reported on
+# stdout so that it can be checked
+TEST_FUNCTION_HEADER = textwrap.dedent(
+    """\
+
+    static int test{idx}() {{
+        try {{
+    """
+)
+
+TEST_FUNCTION_FOOTER = (
+    "".join(
+        textwrap.dedent(
+            f"""\
+            }} catch ({exc}& e) {{
+                std::cout << " {enum.name} " << e.what() << std::endl;
+                return 1;
+            """
         )
+        for exc, enum in (
+            ("ValidationError", Progress.VALIDATION_FAILS),
+            ("std::bad_cast", Progress.CAST_FAILS),
+        )
+    )
+    + textwrap.dedent(
+        """\
+            }
+            return 0;
+        }
+        """
+    )
+)
 
-        prog = tmp_path / "prog"
-        pkg_config_cmd = f"$({test_lib.pkg_config} --cflags --libs {test_lib.basename})"
-        compile_cmd = [
-            "g++",
-            src,
-            "-Wall",
-            "-Werror",
-            "-g",
-            "-o",
-            prog,
-        ]
 
-        if static:
-            compile_cmd.extend(
-                [
-                    "-Wl,-Bstatic",
-                    pkg_config_cmd,
-                    "-Wl,-Bdynamic",
-                ]
-            )
-        else:
-            compile_cmd.extend(
-                [
-                    pkg_config_cmd,
-                    f"-Wl,-rpath={test_lib.rpath}",
-                ]
-            )
+class Compiler(object):
+    def __init__(self, lib, directory):
+        self.lib = lib
+        self.directory = directory
+        self.test_num = itertools.count()
 
-        compile_script = tmp_path / "compile.sh"
-        compile_script.write_text(
-            textwrap.dedent(
-                f"""\
-                #! /bin/sh
-                exec {" ".join(str(s) for s in compile_cmd)}
-                """
-            )
+        self.includes = textwrap.dedent(
+            f"""\
+            #include "{lib.basename}/{lib.basename}.hpp"
+            #include "{lib.basename}/{lib.basename}-jsonld.hpp"
+            #include <iostream>
+            #include <fstream>
+            #include <iomanip>
+            """
+        )
+
+        # Precompile the library headers once so that each test program only
+        # needs to compile its own code. The flags must match those used to
+        # compile the test programs or GCC will ignore the precompiled header
+        self.pch = directory / "test-pch.hpp"
+        self.pch.write_text(self.includes)
+        self.cflags = ["-Wall", "-Werror", "-Winvalid-pch", "-g"]
+        subprocess.run(
+            [
+                "g++",
+                "-x",
+                "c++-header",
+                self.pch,
+                "-o",
+                self.pch.with_suffix(".hpp.gch"),
+            ]
+            + self.cflags
+            + lib.cflags,
+            check=True,
+            stdin=subprocess.DEVNULL,
         )
-        compile_script.chmod(0o755)
 
+    def compile(self, code_fragments, *, progress=Progress.RUNS, static=False):
+        """
+        Compiles a test program from the list of code fragments. Each fragment
+        is placed in its own function, which is selected at runtime by passing
+        its index as the first argument to the program (defaulting to the
+        first fragment).
+
+        Returns a tuple of the compiler return code, the compiler output, and
+        the path to the program. Use check_compile() to validate the result
+        """
+        test_dir = self.directory / f"test{next(self.test_num)}"
+        test_dir.mkdir()
+
+        src = test_dir / "test.cpp"
+        with src.open("w") as f:
+            f.write(self.includes)
+            f.write(TEST_PROGRAM_HEADER.format(namespace=self.lib.namespace))
+            for idx, code_fragment in enumerate(code_fragments):
+                f.write(TEST_FUNCTION_HEADER.format(idx=idx))
+                f.write(textwrap.dedent(code_fragment))
+                f.write(TEST_FUNCTION_FOOTER)
+            f.write(
+                TEST_PROGRAM_FOOTER.format(
+                    tests=", ".join(f"test{i}" for i in range(len(code_fragments)))
+                )
+            )
+
+        prog = test_dir / "prog"
+        compile_cmd = ["g++", "-include", self.pch, src]
+        compile_cmd.extend(self.cflags)
+        compile_cmd.extend(self.lib.cflags)
+
+        if progress == Progress.COMPILE_FAILS:
+            # The program will never be run, so only check that it is valid.
+            # This still instantiates all templates, but skips code
+            # generation and linking
+            compile_cmd.append("-fsyntax-only")
+        else:
+            compile_cmd.extend(["-o", prog])
+            if static:
+                compile_cmd.append("-Wl,-Bstatic")
+                compile_cmd.extend(self.lib.libs)
+                compile_cmd.append("-Wl,-Bdynamic")
+            else:
+                compile_cmd.extend(self.lib.libs)
+                compile_cmd.append(f"-Wl,-rpath={self.lib.rpath}")
+
+        # Include the compiler diagnostics in the output so that they are
+        # reported with any failure
         p = subprocess.run(
-            [compile_script],
+            compile_cmd,
             stdout=subprocess.PIPE,
-            encoding="utf-8",
+            stderr=subprocess.STDOUT,
+            stdin=subprocess.DEVNULL,
         )
+        return (p.returncode, p.stdout.decode("utf-8", "replace"), prog)
+
+    def check_compile(self, result, *, progress=Progress.RUNS):
+        """
+        Checks that the result of compile() matches the expected progress
+
+        Returns the path to the program, or None if the compile was expected to
+        fail
+        """
+        returncode, output, prog = result
         if progress == Progress.COMPILE_FAILS:
             assert (
-                p.returncode != 0
-            ), f"Compile succeeded when failure was expected. Output: {p.stdout}"
+                returncode != 0
+            ), f"Compile succeeded when failure was expected. Output: {output}"
             return None
 
-        assert p.returncode == 0, f"Compile failed. Output: {p.stdout}"
+        assert returncode == 0, f"Compile failed. Output: {output}"
 
         prog.chmod(0o755)
+        return prog
 
+    def build(self, code_fragments, *, progress=Progress.RUNS, static=False):
+        """
+        Compiles and checks a test program. See compile()
+        """
+        return self.check_compile(
+            self.compile(code_fragments, progress=progress, static=static),
+            progress=progress,
+        )
+
+    def run(self, cmd, *, progress=Progress.RUNS):
+        """
+        Runs a compiled test program and checks that it progressed as expected
+
+        Returns the output of the program if it was expected to run
+        successfully, or None otherwise
+        """
         p = subprocess.run(
-            [prog],
+            cmd,
             stdout=subprocess.PIPE,
-            encoding="utf-8",
+            stdin=subprocess.DEVNULL,
         )
+        output = p.stdout.decode("utf-8", "replace")
 
         if progress == Progress.RUN_FAILS:
             assert (
                 p.returncode != 0
-            ), f"Run succeeded when failure was expected. Output: {p.stdout}"
+            ), f"Run succeeded when failure was expected. Output: {output}"
             return None
 
         for e in Progress:
@@ -226,20 +346,95 @@ def compile_test(test_lib, tmp_path):
             if progress == e:
                 assert (
                     p.returncode != 0
-                ), f"Run succeeded when failure was expected. Output: {p.stdout}"
+                ), f"Run succeeded when failure was expected. Output: {output}"
 
                 assert (
-                    e.name in p.stdout.rstrip()
-                ), f"{e.name} was not raised in program. Output: {p.stdout}"
+                    e.name in output.rstrip()
+                ), f"{e.name} was not raised in program. Output: {output}"
                 return None
 
-        assert p.returncode == 0, f"Run failed. Output: {p.stdout}"
+        assert p.returncode == 0, f"Run failed. Output: {output}"
+
+        return output
+
+
+@pytest.fixture(scope="module")
+def compiler(test_lib, tmp_path_factory):
+    yield Compiler(test_lib, tmp_path_factory.mktemp("cppcompiletest"))
+
+
+@pytest.fixture(scope="module")
+def compile_test(compiler):
+    def f(code_fragment, *, progress=Progress.RUNS, static=False):
+        prog = compiler.build([code_fragment], progress=progress, static=static)
+        if prog is None:
+            return None
 
-        return p.stdout
+        return compiler.run([prog], progress=progress)
 
     yield f
 
 
+def batch_test(compiler, tests):
+    """
+    Compiles all of the (code_fragment, progress) tests that are expected to
+    compile into a single program the first time one of them is run, so that
+    each test only needs to run it. Tests that are expected to fail to compile
+    are still compiled separately when they are run so that one of them cannot
+    mask another
+
+    Returns a function that can be called like compile_test() with any of the
+    tests
+    """
+    batch = [
+        code_fragment
+        for code_fragment, progress in tests
+        if progress != Progress.COMPILE_FAILS
+    ]
+    batch_result = None
+
+    def f(code_fragment, *, progress=Progress.RUNS):
+        nonlocal batch_result
+
+        if progress == Progress.COMPILE_FAILS:
+            return compiler.build([code_fragment], progress=progress)
+
+        if batch_result is None:
+            batch_result = compiler.compile(batch)
+
+        # Check the compile here instead of when the batch is built so that a
+        # broken batch is reported as a failure of the tests that use it
+        prog = compiler.check_compile(batch_result)
+        idx = batch.index(code_fragment)
+        return compiler.run([prog, str(idx)], progress=progress)
+
+    return f
+
+
+@pytest.fixture(scope="class")
+def generated(tmp_path_factory, args, basename):
+    """
+    Directory containing the C++ sources generated once for each set of
+    TestOutput arguments. Tests must not modify it
+    """
+    tmp_directory = tmp_path_factory.mktemp("cppoutput")
+    subprocess.run(
+        [
+            "shacl2code",
+            "generate",
+        ]
+        + args
+        + [
+            "cpp",
+            "--output",
+            tmp_directory / basename,
+        ],
+        check=True,
+        stdin=subprocess.DEVNULL,
+    )
+    yield tmp_directory
+
+
 @pytest.mark.parametrize(
     "args,basename,expect",
     [
@@ -254,108 +449,43 @@ def compile_test(test_lib, tmp_path):
             EXPECT_DIR / "cpp" / "context",
         ),
     ],
+    scope="class",
 )
 class TestOutput:
-    def test_generation(self, tmp_path, args, basename, expect):
+    def test_generation(self, generated, expect):
         """
         Tests that the output matches the expected output
         """
-        subprocess.run(
-            [
-                "shacl2code",
-                "generate",
-            ]
-            + args
-            + [
-                "cpp",
-                "--output",
-                tmp_path / basename,
-            ],
-            check=True,
-        )
-
-        for fn in tmp_path.iterdir():
+        for fn in generated.iterdir():
             assert (
                 fn.read_text() == (expect / fn.name).read_text()
             ), f"Mismatch in {fn.name}"
 
-    def test_trailing_whitespace(self, tmp_path, args, basename, expect):
-        """
-        Tests that the generated file does not have trailing whitespace
-        """
-        subprocess.run(
-            [
-                "shacl2code",
-                "generate",
-            ]
-            + args
-            + [
-                "cpp",
-                "--output",
-                tmp_path / basename,
-            ],
-            check=True,
-        )
-
-        for fn in tmp_path.iterdir():
-            with fn.open("r") as f:
-                for lineno, line in enumerate(f.readlines()):
-                    line = line.rstrip("\n")
-                    assert (
-                        re.search(r"\s+$", line) is None
-                    ), f"{fn}: Line {lineno + 1} has trailing whitespace: {line!r}"
-
-    def test_tabs(self, tmp_path, args, basename, expect):
+    def test_whitespace(self, generated, expect):
         """
-        Tests that the output file doesn't contain tabs
+        Tests that the generated files do not have trailing whitespace or tabs
         """
-        subprocess.run(
-            [
-                "shacl2code",
-                "generate",
-            ]
-            + args
-            + [
-                "cpp",
-                "--output",
-                tmp_path / basename,
-            ],
-            check=True,
-        )
-
-        for fn in tmp_path.iterdir():
-            if fn.name == "Makefile":
-                continue
-
-            with fn.open("r") as f:
-                for lineno, line in enumerate(f.readlines()):
-                    assert (
-                        "\t" not in line
-                    ), f"{fn}: Line {lineno + 1} has tabs: {line!r}"
+        for fn in generated.iterdir():
+            check_whitespace(
+                fn.read_text(),
+                # Makefiles require tabs
+                allow_tabs=fn.name == "Makefile",
+                name=fn,
+            )
 
-    def test_output_compile(self, tmp_path, args, basename, expect):
-        subprocess.run(
-            [
-                "shacl2code",
-                "generate",
-            ]
-            + args
-            + [
-                "cpp",
-                "--output",
-                tmp_path / basename,
-            ],
-            check=True,
-        )
+    def test_output_compile(self, tmp_path, generated, expect):
+        # Build in a copy so the shared output is not modified
+        shutil.copytree(generated, tmp_path, dirs_exist_ok=True)
 
         subprocess.run(
             [
                 "make",
-                "-j" + str(multiprocessing.cpu_count()),
+                "-j" + str(make_jobs()),
                 "CXXFLAGS=-Wall -Werror -g -save-temps",
             ],
             check=True,
             cwd=tmp_path,
+            stdin=subprocess.DEVNULL,
         )
 
         install_dir = tmp_path / "install"
@@ -363,6 +493,7 @@ class TestOutput:
             ["make", "install", "PREFIX=" + str(install_dir)],
             check=True,
             cwd=tmp_path,
+            stdin=subprocess.DEVNULL,
         )
 
 
@@ -370,51 +501,42 @@ def test_compile(compile_test):
     compile_test("")
 
 
+HEADER_TEST_SOURCE = textwrap.dedent(
+    """\
+    #include <{basename}/{header}>
+
+    int main(int argc, char** argv) {{
+        return 0;
+    }}
+    """
+)
+
+
 def test_headers(test_lib, tmp_path):
     for h in test_lib.directory.glob("*.hpp"):
         src = tmp_path / (h.name + ".cpp")
         src.write_text(
-            textwrap.dedent(
-                f"""\
-                #include <{test_lib.basename}/{h.name}>
-
-                int main(int argc, char** argv) {{
-                    return 0;
-                }}
-                """
-            )
+            HEADER_TEST_SOURCE.format(basename=test_lib.basename, header=h.name)
         )
 
         prog = tmp_path / "prog"
-        pkg_config_cmd = f"$({test_lib.pkg_config} --cflags --libs {test_lib.basename})"
-        compile_cmd = [
-            "g++",
-            src,
-            "-Wall",
-            "-Werror",
-            "-g",
-            "-o",
-            prog,
-            pkg_config_cmd,
-            f"-Wl,-rpath={test_lib.rpath}",
-        ]
-
-        compile_script = tmp_path / "compile.sh"
-        compile_script.write_text(
-            textwrap.dedent(
-                f"""\
-                #! /bin/sh
-                exec {" ".join(str(s) for s in compile_cmd)}
-                """
-            )
-        )
-        compile_script.chmod(0o755)
-
         subprocess.run(
-            [compile_script],
+            [
+                "g++",
+                src,
+                "-Wall",
+                "-Werror",
+                "-g",
+                "-o",
+                prog,
+            ]
+            + test_lib.cflags
+            + test_lib.libs
+            + [f"-Wl,-rpath={test_lib.rpath}"],
             stdout=subprocess.PIPE,
             encoding="utf-8",
             check=True,
+            stdin=subprocess.DEVNULL,
         )
 
 
@@ -439,163 +561,160 @@ def test_no_namespace(tmp_path_factory, model_server):
 C_STRING_VAL = '"string"'
 CPP_STRING_VAL = 'std::string("string")'
 
-
-@pytest.mark.parametrize(
-    "prop,value,expect",
-    [
-        #
-        # positive integer
-        ("_test_class_positive_integer_prop", "1", "1"),
-        ("_test_class_positive_integer_prop", "-1", Progress.VALIDATION_FAILS),
-        ("_test_class_positive_integer_prop", "0", Progress.VALIDATION_FAILS),
-        # bool is converted to integer
-        ("_test_class_positive_integer_prop", "false", Progress.VALIDATION_FAILS),
-        ("_test_class_positive_integer_prop", "true", "1"),
-        # Implicit conversion from double to int
-        ("_test_class_positive_integer_prop", "1.0", "1"),
-        ("_test_class_positive_integer_prop", "1.5", "1"),
-        ("_test_class_positive_integer_prop", "-1.0", Progress.VALIDATION_FAILS),
-        ("_test_class_positive_integer_prop", "0.0", Progress.VALIDATION_FAILS),
-        # String value
-        ("_test_class_positive_integer_prop", C_STRING_VAL, Progress.COMPILE_FAILS),
-        ("_test_class_positive_integer_prop", CPP_STRING_VAL, Progress.COMPILE_FAILS),
-        #
-        # Non-negative integer
-        ("_test_class_nonnegative_integer_prop", "1", "1"),
-        ("_test_class_nonnegative_integer_prop", "-1", Progress.VALIDATION_FAILS),
-        ("_test_class_nonnegative_integer_prop", "0", "0"),
-        # bool is converted to integer
-        ("_test_class_nonnegative_integer_prop", "false", "0"),
-        ("_test_class_nonnegative_integer_prop", "true", "1"),
-        # Implicit conversion from double to int
-        ("_test_class_nonnegative_integer_prop", "1.0", "1"),
-        ("_test_class_nonnegative_integer_prop", "1.5", "1"),
-        ("_test_class_nonnegative_integer_prop", "-1.0", Progress.VALIDATION_FAILS),
-        ("_test_class_nonnegative_integer_prop", "0.0", "0"),
-        # String value
-        ("_test_class_nonnegative_integer_prop", C_STRING_VAL, Progress.COMPILE_FAILS),
-        (
-            "_test_class_nonnegative_integer_prop",
-            CPP_STRING_VAL,
-            Progress.COMPILE_FAILS,
-        ),
-        #
-        # Integer
-        ("_test_class_integer_prop", "1", "1"),
-        ("_test_class_integer_prop", "-1", "-1"),
-        ("_test_class_integer_prop", "0", "0"),
-        # bool is converted to integer
-        ("_test_class_integer_prop", "false", "0"),
-        ("_test_class_integer_prop", "true", "1"),
-        # Implicit conversion from double to int
-        ("_test_class_integer_prop", "1.0", "1"),
-        ("_test_class_integer_prop", "1.5", "1"),
-        ("_test_class_integer_prop", "-1.0", "-1"),
-        ("_test_class_integer_prop", "0.0", "0"),
-        # String value
-        ("_test_class_integer_prop", C_STRING_VAL, Progress.COMPILE_FAILS),
-        ("_test_class_integer_prop", CPP_STRING_VAL, Progress.COMPILE_FAILS),
-        #
-        # Float
-        ("_test_class_float_prop", "-1", "-1.0"),
-        ("_test_class_float_prop", "-1.0", "-1.0"),
-        ("_test_class_float_prop", "0", "0.0"),
-        ("_test_class_float_prop", "0.0", "0.0"),
-        ("_test_class_float_prop", "1", "1.0"),
-        ("_test_class_float_prop", "1.0", "1.0"),
-        ("_test_class_float_prop", "false", "0.0"),
-        ("_test_class_float_prop", "true", "1.0"),
-        # String value
-        ("_test_class_float_prop", C_STRING_VAL, Progress.COMPILE_FAILS),
-        ("_test_class_float_prop", CPP_STRING_VAL, Progress.COMPILE_FAILS),
-        #
-        # Boolean prop
-        ("_test_class_boolean_prop", "true", "1"),
-        ("_test_class_boolean_prop", "1", "1"),
-        ("_test_class_boolean_prop", "-1", "1"),
-        ("_test_class_boolean_prop", "-1.0", "1"),
-        ("_test_class_boolean_prop", "false", "0"),
-        ("_test_class_boolean_prop", "0", "0"),
-        ("_test_class_boolean_prop", "0.0", "0"),
-        # String value
-        ("_test_class_boolean_prop", C_STRING_VAL, "1"),
-        ("_test_class_boolean_prop", CPP_STRING_VAL, Progress.COMPILE_FAILS),
-        #
-        # String Property
-        ("_test_class_string_scalar_prop", C_STRING_VAL, "string"),
-        ("_test_class_string_scalar_prop", CPP_STRING_VAL, "string"),
-        ("_test_class_string_scalar_prop", '""', ""),
-        ("_test_class_string_scalar_prop", "0", Progress.RUN_FAILS),
-        ("_test_class_string_scalar_prop", "1", Progress.COMPILE_FAILS),
-        ("_test_class_string_scalar_prop", "1.0", Progress.COMPILE_FAILS),
-        ("_test_class_string_scalar_prop", "0.0", Progress.COMPILE_FAILS),
-        ("_test_class_string_scalar_prop", "true", Progress.COMPILE_FAILS),
-        ("_test_class_string_scalar_prop", "false", Progress.COMPILE_FAILS),
-        #
-        # Enumerated value
-        (
-            "_test_class_enum_prop",
-            '"http://example.org/enumType/foo"',
-            "http://example.org/enumType/foo",
-        ),
-        (
-            "_test_class_enum_prop",
-            'std::string("http://example.org/enumType/foo")',
-            "http://example.org/enumType/foo",
-        ),
-        ("_test_class_enum_prop", "enumType::foo", "http://example.org/enumType/foo"),
-        ("_test_class_enum_prop", C_STRING_VAL, Progress.VALIDATION_FAILS),
-        ("_test_class_enum_prop", CPP_STRING_VAL, Progress.VALIDATION_FAILS),
-        ("_test_class_enum_prop", "0", Progress.RUN_FAILS),
-        ("_test_class_enum_prop", "1", Progress.COMPILE_FAILS),
-        ("_test_class_enum_prop", "1.0", Progress.COMPILE_FAILS),
-        ("_test_class_enum_prop", "0.0", Progress.COMPILE_FAILS),
-        ("_test_class_enum_prop", "true", Progress.COMPILE_FAILS),
-        ("_test_class_enum_prop", "false", Progress.COMPILE_FAILS),
-        #
-        # Pattern validated string
-        ("_test_class_regex", '"foo1"', "foo1"),
-        ("_test_class_regex", '"foo2"', "foo2"),
-        ("_test_class_regex", '"foo2a"', "foo2a"),
-        ("_test_class_regex", '"bar"', Progress.VALIDATION_FAILS),
-        ("_test_class_regex", '"fooa"', Progress.VALIDATION_FAILS),
-        ("_test_class_regex", '"afoo1"', Progress.VALIDATION_FAILS),
-        #
-        # ID assignment
-        ("_id", '"_:blank"', "_:blank"),
-        ("_id", '"http://example.com/test"', "http://example.com/test"),
-        ("_id", '"not-iri"', Progress.VALIDATION_FAILS),
-        #
-        # Date Time
-        (
-            "_test_class_datetimestamp_scalar_prop",
-            "DateTime(0)",
-            "1970-01-01T00:00:00Z",
-        ),
-        (
-            "_test_class_datetimestamp_scalar_prop",
-            "DateTime(12345,4800)",
-            "1970-01-01T03:25:45+01:20",
-        ),
-        (
-            "_test_class_datetimestamp_scalar_prop",
-            "DateTime(12345,-4800)",
-            "1970-01-01T03:25:45-01:20",
-        ),
-        # Implicit constructor not allowed
-        ("_test_class_datetimestamp_scalar_prop", "0", Progress.COMPILE_FAILS),
-        ("_test_class_datetimestamp_scalar_prop", "1.0", Progress.COMPILE_FAILS),
-        ("_test_class_datetimestamp_scalar_prop", C_STRING_VAL, Progress.COMPILE_FAILS),
-        (
-            "_test_class_datetimestamp_scalar_prop",
-            CPP_STRING_VAL,
-            Progress.COMPILE_FAILS,
-        ),
-    ],
-)
-def test_scalar_prop_validation(compile_test, prop, value, expect):
-    output = compile_test(
-        f"""\
+SCALAR_PROP_TESTS = [
+    #
+    # positive integer
+    ("_test_class_positive_integer_prop", "1", "1"),
+    ("_test_class_positive_integer_prop", "-1", Progress.VALIDATION_FAILS),
+    ("_test_class_positive_integer_prop", "0", Progress.VALIDATION_FAILS),
+    # bool is converted to integer
+    ("_test_class_positive_integer_prop", "false", Progress.VALIDATION_FAILS),
+    ("_test_class_positive_integer_prop", "true", "1"),
+    # Implicit conversion from double to int
+    ("_test_class_positive_integer_prop", "1.0", "1"),
+    ("_test_class_positive_integer_prop", "1.5", "1"),
+    ("_test_class_positive_integer_prop", "-1.0", Progress.VALIDATION_FAILS),
+    ("_test_class_positive_integer_prop", "0.0", Progress.VALIDATION_FAILS),
+    # String value
+    ("_test_class_positive_integer_prop", C_STRING_VAL, Progress.COMPILE_FAILS),
+    ("_test_class_positive_integer_prop", CPP_STRING_VAL, Progress.COMPILE_FAILS),
+    #
+    # Non-negative integer
+    ("_test_class_nonnegative_integer_prop", "1", "1"),
+    ("_test_class_nonnegative_integer_prop", "-1", Progress.VALIDATION_FAILS),
+    ("_test_class_nonnegative_integer_prop", "0", "0"),
+    # bool is converted to integer
+    ("_test_class_nonnegative_integer_prop", "false", "0"),
+    ("_test_class_nonnegative_integer_prop", "true", "1"),
+    # Implicit conversion from double to int
+    ("_test_class_nonnegative_integer_prop", "1.0", "1"),
+    ("_test_class_nonnegative_integer_prop", "1.5", "1"),
+    ("_test_class_nonnegative_integer_prop", "-1.0", Progress.VALIDATION_FAILS),
+    ("_test_class_nonnegative_integer_prop", "0.0", "0"),
+    # String value
+    ("_test_class_nonnegative_integer_prop", C_STRING_VAL, Progress.COMPILE_FAILS),
+    (
+        "_test_class_nonnegative_integer_prop",
+        CPP_STRING_VAL,
+        Progress.COMPILE_FAILS,
+    ),
+    #
+    # Integer
+    ("_test_class_integer_prop", "1", "1"),
+    ("_test_class_integer_prop", "-1", "-1"),
+    ("_test_class_integer_prop", "0", "0"),
+    # bool is converted to integer
+    ("_test_class_integer_prop", "false", "0"),
+    ("_test_class_integer_prop", "true", "1"),
+    # Implicit conversion from double to int
+    ("_test_class_integer_prop", "1.0", "1"),
+    ("_test_class_integer_prop", "1.5", "1"),
+    ("_test_class_integer_prop", "-1.0", "-1"),
+    ("_test_class_integer_prop", "0.0", "0"),
+    # String value
+    ("_test_class_integer_prop", C_STRING_VAL, Progress.COMPILE_FAILS),
+    ("_test_class_integer_prop", CPP_STRING_VAL, Progress.COMPILE_FAILS),
+    #
+    # Float
+    ("_test_class_float_prop", "-1", "-1.0"),
+    ("_test_class_float_prop", "-1.0", "-1.0"),
+    ("_test_class_float_prop", "0", "0.0"),
+    ("_test_class_float_prop", "0.0", "0.0"),
+    ("_test_class_float_prop", "1", "1.0"),
+    ("_test_class_float_prop", "1.0", "1.0"),
+    ("_test_class_float_prop", "false", "0.0"),
+    ("_test_class_float_prop", "true", "1.0"),
+    # String value
+    ("_test_class_float_prop", C_STRING_VAL, Progress.COMPILE_FAILS),
+    ("_test_class_float_prop", CPP_STRING_VAL, Progress.COMPILE_FAILS),
+    #
+    # Boolean prop
+    ("_test_class_boolean_prop", "true", "1"),
+    ("_test_class_boolean_prop", "1", "1"),
+    ("_test_class_boolean_prop", "-1", "1"),
+    ("_test_class_boolean_prop", "-1.0", "1"),
+    ("_test_class_boolean_prop", "false", "0"),
+    ("_test_class_boolean_prop", "0", "0"),
+    ("_test_class_boolean_prop", "0.0", "0"),
+    # String value
+    ("_test_class_boolean_prop", C_STRING_VAL, "1"),
+    ("_test_class_boolean_prop", CPP_STRING_VAL, Progress.COMPILE_FAILS),
+    #
+    # String Property
+    ("_test_class_string_scalar_prop", C_STRING_VAL, "string"),
+    ("_test_class_string_scalar_prop", CPP_STRING_VAL, "string"),
+    ("_test_class_string_scalar_prop", '""', ""),
+    ("_test_class_string_scalar_prop", "0", Progress.RUN_FAILS),
+    ("_test_class_string_scalar_prop", "1", Progress.COMPILE_FAILS),
+    ("_test_class_string_scalar_prop", "1.0", Progress.COMPILE_FAILS),
+    ("_test_class_string_scalar_prop", "0.0", Progress.COMPILE_FAILS),
+    ("_test_class_string_scalar_prop", "true", Progress.COMPILE_FAILS),
+    ("_test_class_string_scalar_prop", "false", Progress.COMPILE_FAILS),
+    #
+    # Enumerated value
+    (
+        "_test_class_enum_prop",
+        '"http://example.org/enumType/foo"',
+        "http://example.org/enumType/foo",
+    ),
+    (
+        "_test_class_enum_prop",
+        'std::string("http://example.org/enumType/foo")',
+        "http://example.org/enumType/foo",
+    ),
+    ("_test_class_enum_prop", "enumType::foo", "http://example.org/enumType/foo"),
+    ("_test_class_enum_prop", C_STRING_VAL, Progress.VALIDATION_FAILS),
+    ("_test_class_enum_prop", CPP_STRING_VAL, Progress.VALIDATION_FAILS),
+    ("_test_class_enum_prop", "0", Progress.RUN_FAILS),
+    ("_test_class_enum_prop", "1", Progress.COMPILE_FAILS),
+    ("_test_class_enum_prop", "1.0", Progress.COMPILE_FAILS),
+    ("_test_class_enum_prop", "0.0", Progress.COMPILE_FAILS),
+    ("_test_class_enum_prop", "true", Progress.COMPILE_FAILS),
+    ("_test_class_enum_prop", "false", Progress.COMPILE_FAILS),
+    #
+    # Pattern validated string
+    ("_test_class_regex", '"foo1"', "foo1"),
+    ("_test_class_regex", '"foo2"', "foo2"),
+    ("_test_class_regex", '"foo2a"', "foo2a"),
+    ("_test_class_regex", '"bar"', Progress.VALIDATION_FAILS),
+    ("_test_class_regex", '"fooa"', Progress.VALIDATION_FAILS),
+    ("_test_class_regex", '"afoo1"', Progress.VALIDATION_FAILS),
+    #
+    # ID assignment
+    ("_id", '"_:blank"', "_:blank"),
+    ("_id", '"http://example.com/test"', "http://example.com/test"),
+    ("_id", '"not-iri"', Progress.VALIDATION_FAILS),
+    #
+    # Date Time
+    (
+        "_test_class_datetimestamp_scalar_prop",
+        "DateTime(0)",
+        "1970-01-01T00:00:00Z",
+    ),
+    (
+        "_test_class_datetimestamp_scalar_prop",
+        "DateTime(12345,4800)",
+        "1970-01-01T03:25:45+01:20",
+    ),
+    (
+        "_test_class_datetimestamp_scalar_prop",
+        "DateTime(12345,-4800)",
+        "1970-01-01T03:25:45-01:20",
+    ),
+    # Implicit constructor not allowed
+    ("_test_class_datetimestamp_scalar_prop", "0", Progress.COMPILE_FAILS),
+    ("_test_class_datetimestamp_scalar_prop", "1.0", Progress.COMPILE_FAILS),
+    ("_test_class_datetimestamp_scalar_prop", C_STRING_VAL, Progress.COMPILE_FAILS),
+    (
+        "_test_class_datetimestamp_scalar_prop",
+        CPP_STRING_VAL,
+        Progress.COMPILE_FAILS,
+    ),
+]
+
+
+def scalar_prop_code(prop, value):
+    return f"""\
         // Set precision in case we output a floating point number
         std::cout << std::fixed << std::setprecision(1);
 
@@ -613,7 +732,27 @@ def test_scalar_prop_validation(compile_test, prop, value, expect):
         auto other = make_obj<test_class>();
         other->{prop} = c->{prop};
         std::cout << other->{prop}.get() << std::endl;
-        """,
+        """
+
+
+@pytest.fixture(scope="module")
+def scalar_prop_test(compiler):
+    yield batch_test(
+        compiler,
+        [
+            (
+                scalar_prop_code(prop, value),
+                expect if isinstance(expect, Progress) else Progress.RUNS,
+            )
+            for prop, value, expect in SCALAR_PROP_TESTS
+        ],
+    )
+
+
+@pytest.mark.parametrize("prop,value,expect", SCALAR_PROP_TESTS)
+def test_scalar_prop_validation(scalar_prop_test, prop, value, expect):
+    output = scalar_prop_test(
+        scalar_prop_code(prop, value),
         progress=expect if isinstance(expect, Progress) else Progress.RUNS,
     )
 
@@ -627,62 +766,60 @@ def test_scalar_prop_validation(compile_test, prop, value, expect):
         ), f"Invalid output. Expected {expect_lines!r}, got {output_lines!r}"
 
 
-@pytest.mark.parametrize(
-    "prop,value,expect",
-    [
-        # Blank node assignment
-        ("_test_class_class_prop", 'Ref<test_class>("_:blank")', "IRI _:blank"),
-        (
-            "_test_class_class_prop",
-            'Ref<test_class>("http://example.com/test")',
-            "IRI http://example.com/test",
-        ),
-        (
-            "_test_class_class_prop",
-            'Ref<test_class>("not-iri")',
-            Progress.VALIDATION_FAILS,
-        ),
-        # Derived assignment
-        (
-            "_test_class_class_prop",
-            'Ref<test_derived_class>("_:blank")',
-            "IRI _:blank",
-        ),
-        ("_test_class_class_prop", "d", "OBJECT _:d"),
-        # Parent assignment
-        (
-            "_test_class_class_prop",
-            'Ref<parent_class>("_:blank")',
-            Progress.COMPILE_FAILS,
-        ),
-        # Named individual assignment
-        (
-            "_test_class_class_prop",
-            "test_class::named",
-            "IRI http://example.org/test-class/named",
-        ),
-        # Named individual, but wrong type
-        (
-            "_test_class_class_prop",
-            "enumType::foo",
-            Progress.VALIDATION_FAILS,
-        ),
-        ("_test_class_class_prop", "p", Progress.COMPILE_FAILS),
-        # Self assignment
-        ("_test_class_class_prop", "c", "OBJECT _:c"),
-        # Self assignment by string
-        ("_test_class_class_prop", "c->_id.get()", "IRI _:c"),
-        # Non derived class assignment
-        (
-            "_test_class_class_prop",
-            'Ref<test_another_class>("_:blank")',
-            Progress.COMPILE_FAILS,
-        ),
-    ],
-)
-def test_class_prop_validation(compile_test, prop, value, expect):
-    output = compile_test(
-        f"""\
+CLASS_PROP_TESTS = [
+    # Blank node assignment
+    ("_test_class_class_prop", 'Ref<test_class>("_:blank")', "IRI _:blank"),
+    (
+        "_test_class_class_prop",
+        'Ref<test_class>("http://example.com/test")',
+        "IRI http://example.com/test",
+    ),
+    (
+        "_test_class_class_prop",
+        'Ref<test_class>("not-iri")',
+        Progress.VALIDATION_FAILS,
+    ),
+    # Derived assignment
+    (
+        "_test_class_class_prop",
+        'Ref<test_derived_class>("_:blank")',
+        "IRI _:blank",
+    ),
+    ("_test_class_class_prop", "d", "OBJECT _:d"),
+    # Parent assignment
+    (
+        "_test_class_class_prop",
+        'Ref<parent_class>("_:blank")',
+        Progress.COMPILE_FAILS,
+    ),
+    # Named individual assignment
+    (
+        "_test_class_class_prop",
+        "test_class::named",
+        "IRI http://example.org/test-class/named",
+    ),
+    # Named individual, but wrong type
+    (
+        "_test_class_class_prop",
+        "enumType::foo",
+        Progress.VALIDATION_FAILS,
+    ),
+    ("_test_class_class_prop", "p", Progress.COMPILE_FAILS),
+    # Self assignment
+    ("_test_class_class_prop", "c", "OBJECT _:c"),
+    # Self assignment by string
+    ("_test_class_class_prop", "c->_id.get()", "IRI _:c"),
+    # Non derived class assignment
+    (
+        "_test_class_class_prop",
+        'Ref<test_another_class>("_:blank")',
+        Progress.COMPILE_FAILS,
+    ),
+]
+
+
+def class_prop_code(prop, value):
+    return f"""\
         auto p = make_obj<parent_class>();
         p->_id = "_:p";
 
@@ -698,7 +835,27 @@ def test_class_prop_validation(compile_test, prop, value, expect):
         }} else {{
             std::cout << "IRI " << c->{prop}.iri() << std::endl;
         }}
-        """,
+        """
+
+
+@pytest.fixture(scope="module")
+def class_prop_test(compiler):
+    yield batch_test(
+        compiler,
+        [
+            (
+                class_prop_code(prop, value),
+                expect if isinstance(expect, Progress) else Progress.RUNS,
+            )
+            for prop, value, expect in CLASS_PROP_TESTS
+        ],
+    )
+
+
+@pytest.mark.parametrize("prop,value,expect", CLASS_PROP_TESTS)
+def test_class_prop_validation(class_prop_test, prop, value, expect):
+    output = class_prop_test(
+        class_prop_code(prop, value),
         progress=expect if isinstance(expect, Progress) else Progress.RUNS,
     )
 
@@ -948,69 +1105,85 @@ def test_ref_explict_cast_to_abstract(compile_test):
     assert output.rstrip() == "_:foo"
 
 
-@pytest.mark.parametrize(
-    "create_args,expect,tzoffset",
-    [
-        ((0,), "1970-01-01T00:00:00Z", 0),
-        ((12345, 0), "1970-01-01T03:25:45Z", 0),
-        ((12345, 3600), "1970-01-01T03:25:45+01:00", 3600),
-        ((12345, 4800), "1970-01-01T03:25:45+01:20", 4800),
-        ((12345, -3600), "1970-01-01T03:25:45-01:00", -3600),
-        ((12345, -4800), "1970-01-01T03:25:45-01:20", -4800),
-    ],
-)
-def test_DateTime_toString(compile_test, create_args, expect, tzoffset):
+DATETIME_TOSTRING_TESTS = [
+    ((0,), "1970-01-01T00:00:00Z", 0),
+    ((12345, 0), "1970-01-01T03:25:45Z", 0),
+    ((12345, 3600), "1970-01-01T03:25:45+01:00", 3600),
+    ((12345, 4800), "1970-01-01T03:25:45+01:20", 4800),
+    ((12345, -3600), "1970-01-01T03:25:45-01:00", -3600),
+    ((12345, -4800), "1970-01-01T03:25:45-01:20", -4800),
+]
+
+
+def datetime_tostring_code(create_args):
     args = ", ".join(repr(r) for r in create_args)
-    output = compile_test(
-        f"""\
+    return f"""\
         std::cout << DateTime({args}).toString() << std::endl;
         """
+
+
+def datetime_tzoffset_code(create_args):
+    args = ", ".join(repr(r) for r in create_args)
+    return f"""\
+        std::cout << DateTime({args}).tzOffsetSeconds() << std::endl;
+        """
+
+
+@pytest.fixture(scope="module")
+def datetime_tostring_test(compiler):
+    yield batch_test(
+        compiler,
+        [
+            (code(create_args), Progress.RUNS)
+            for create_args, _, _ in DATETIME_TOSTRING_TESTS
+            for code in (datetime_tostring_code, datetime_tzoffset_code)
+        ],
     )
 
+
+@pytest.mark.parametrize("create_args,expect,tzoffset", DATETIME_TOSTRING_TESTS)
+def test_DateTime_toString(datetime_tostring_test, create_args, expect, tzoffset):
+    args = ", ".join(repr(r) for r in create_args)
+    output = datetime_tostring_test(datetime_tostring_code(create_args))
+
     assert (
         output.rstrip() == expect
     ), f"Bad string result for DateTime({args}).toString(). Expected {expect!r}. Got {output.rstrip()!r}"
 
-    output = compile_test(
-        f"""\
-        std::cout << DateTime({args}).tzOffsetSeconds() << std::endl;
-        """
-    )
+    output = datetime_tostring_test(datetime_tzoffset_code(create_args))
 
     assert (
         int(output.rstrip()) == tzoffset
     ), f"Bad TZ offset. Expected {tzoffset!r}, got {int(output.rstrip())!r}"
 
 
-@pytest.mark.parametrize(
-    "s,valid,time,tzoffset",
-    [
-        ("1970-01-01T00:00:00Z", True, 0, 0),
-        ("1970-01-01T03:25:45Z", True, 12345, 0),
-        ("1970-01-01T03:25:45+00:00", True, 12345, 0),
-        ("1970-01-01T03:25:45+01:00", True, 12345, 3600),
-        ("1970-01-01T03:25:45+01:20", True, 12345, 4800),
-        ("1970-01-01T03:25:45-01:00", True, 12345, -3600),
-        ("1970-01-01T03:25:45-01:20", True, 12345, -4800),
-        ("1970-01-01T03:25:45+01", False, 0, 0),
-        ("1970-01-01T03:25:45-01", False, 0, 0),
-        ("1970-01-01T03:25:45+1", False, 0, 0),
-        ("1970-01-01T03:25:45-1", False, 0, 0),
-        # Missing TimeZone
-        ("1970-01-01T03:25:45", False, 0, 0),
-        # Bad timezone hour
-        ("1970-01-01T03:25:45-13:20", False, 0, 0),
-        ("1970-01-01T03:25:45+13:20", False, 0, 0),
-        # Bad timezone minute
-        ("1970-01-01T03:25:45-10:-10", False, 0, 0),
-        ("1970-01-01T03:25:45+10:60", False, 0, 0),
-        ("1970-01-01T03:25:45-12:01", False, 0, 0),
-        ("1970-01-01T03:25:45+12:01", False, 0, 0),
-    ],
-)
-def test_DateTime_fromString(compile_test, s, valid, time, tzoffset):
-    output = compile_test(
-        f"""
+DATETIME_FROMSTRING_TESTS = [
+    ("1970-01-01T00:00:00Z", True, 0, 0),
+    ("1970-01-01T03:25:45Z", True, 12345, 0),
+    ("1970-01-01T03:25:45+00:00", True, 12345, 0),
+    ("1970-01-01T03:25:45+01:00", True, 12345, 3600),
+    ("1970-01-01T03:25:45+01:20", True, 12345, 4800),
+    ("1970-01-01T03:25:45-01:00", True, 12345, -3600),
+    ("1970-01-01T03:25:45-01:20", True, 12345, -4800),
+    ("1970-01-01T03:25:45+01", False, 0, 0),
+    ("1970-01-01T03:25:45-01", False, 0, 0),
+    ("1970-01-01T03:25:45+1", False, 0, 0),
+    ("1970-01-01T03:25:45-1", False, 0, 0),
+    # Missing TimeZone
+    ("1970-01-01T03:25:45", False, 0, 0),
+    # Bad timezone hour
+    ("1970-01-01T03:25:45-13:20", False, 0, 0),
+    ("1970-01-01T03:25:45+13:20", False, 0, 0),
+    # Bad timezone minute
+    ("1970-01-01T03:25:45-10:-10", False, 0, 0),
+    ("1970-01-01T03:25:45+10:60", False, 0, 0),
+    ("1970-01-01T03:25:45-12:01", False, 0, 0),
+    ("1970-01-01T03:25:45+12:01", False, 0, 0),
+]
+
+
+def datetime_fromstring_code(s):
+    return f"""
         auto d = DateTime::fromString("{s}", true);
         if (d) {{
             auto dt = d.value();
@@ -1020,8 +1193,23 @@ def test_DateTime_fromString(compile_test, s, valid, time, tzoffset):
             std::cout << "INVALID" << std::endl;
         }}
         """
+
+
+@pytest.fixture(scope="module")
+def datetime_fromstring_test(compiler):
+    yield batch_test(
+        compiler,
+        [
+            (datetime_fromstring_code(s), Progress.RUNS)
+            for s, _, _, _ in DATETIME_FROMSTRING_TESTS
+        ],
     )
 
+
+@pytest.mark.parametrize("s,valid,time,tzoffset", DATETIME_FROMSTRING_TESTS)
+def test_DateTime_fromString(datetime_fromstring_test, s, valid, time, tzoffset):
+    output = datetime_fromstring_test(datetime_fromstring_code(s))
+
     if valid:
         expect = [str(time), str(tzoffset)]
     else:
@@ -1442,7 +1630,12 @@ def test_docs(test_lib, tmp_path):
 
     assert not missing, "Some Doxygen settings were not found: " + ", ".join(missing)
 
-    subprocess.run(["doxygen", tmp_doxyfile], check=True, cwd=test_lib.directory)
+    subprocess.run(
+        ["doxygen", tmp_doxyfile],
+        check=True,
+        cwd=test_lib.directory,
+        stdin=subprocess.DEVNULL,
+    )
 
 
 @jsonvalidation.validation_tests()
@@ -1450,12 +1643,13 @@ def test_json_validation(passes, data, tmp_path, test_lib, test_context_url):
     jsonvalidation.replace_context(data, test_context_url)
 
     data_file = tmp_path / "data.json"
-    data_file.write_text(json.dumps(data))
+    data_file.write_bytes(json.dumps(data, separators=(",", ":")).encode("utf-8"))
     p = subprocess.run(
         [
             test_lib.bindir / f"{ test_lib.basename }-validate",
             data_file,
-        ]
+        ],
+        stdin=subprocess.DEVNULL,
     )
 
     if passes:
@@ -1469,12 +1663,13 @@ def test_json_types(passes, data, tmp_path, test_lib, test_context_url):
     jsonvalidation.replace_context(data, test_context_url)
 
     data_file = tmp_path / "data.json"
-    data_file.write_text(json.dumps(data))
+    data_file.write_bytes(json.dumps(data, separators=(",", ":")).encode("utf-8"))
     p = subprocess.run(
         [
             test_lib.bindir / f"{ test_lib.basename }-validate",
             data_file,
-        ]
+        ],
+        stdin=subprocess.DEVNULL,
     )
 
     if passes:
@@ -3,13 +3,13 @@
 #
 # SPDX-License-Identifier: MIT
 
-import re
 import subprocess
 import json
 import jsonschema
 import pytest
 from pathlib import Path
 import jsonvalidation
+from whitespace import check_whitespace
 
 THIS_FILE = Path(__file__)
 THIS_DIR = THIS_FILE.parent
@@ -24,6 +24,29 @@ TEST_CONTEXT = THIS_DIR / "data" / "model" / "test-context.json"
 SPDX3_CONTEXT_URL = "https://spdx.github.io/spdx-3-model/context.json"
 
 
+@pytest.fixture(scope="class")
+def generated(args):
+    """
+    JSON schema generated once for each set of TestOutput arguments
+    """
+    p = subprocess.run(
+        [
+            "shacl2code",
+            "generate",
+        ]
+        + args
+        + [
+            "jsonschema",
+            "--output",
+            "-",
+        ],
+        check=True,
+        stdout=subprocess.PIPE,
+        encoding="utf-8",
+    )
+    yield p.stdout
+
+
 @pytest.mark.parametrize(
     "args,expect",
     [
@@ -36,6 +59,7 @@ SPDX3_CONTEXT_URL = "https://spdx.github.io/spdx-3-model/context.json"
             EXPECT_DIR / "jsonschema" / "context" / "test-context.json",
         ),
     ],
+    scope="class",
 )
 class TestOutput:
     def test_generation(self, tmp_path, args, expect):
@@ -62,75 +86,17 @@ class TestOutput:
             with outfile.open("r") as out_f:
                 assert out_f.read() == expect_f.read()
 
-    def test_output_syntax(self, args, expect):
+    def test_output_syntax(self, generated, expect):
         """
         Checks that the output file is valid json syntax by parsing it with Python
         """
-        p = subprocess.run(
-            [
-                "shacl2code",
-                "generate",
-            ]
-            + args
-            + [
-                "jsonschema",
-                "--output",
-                "-",
-            ],
-            check=True,
-            stdout=subprocess.PIPE,
-            encoding="utf-8",
-        )
-
-        json.loads(p.stdout)
+        json.loads(generated)
 
-    def test_trailing_whitespace(self, args, expect):
+    def test_whitespace(self, generated, expect):
         """
-        Tests that the generated file does not have trailing whitespace
+        Tests that the generated file does not have trailing whitespace or tabs
         """
-        p = subprocess.run(
-            [
-                "shacl2code",
-                "generate",
-            ]
-            + args
-            + [
-                "jsonschema",
-                "--output",
-                "-",
-            ],
-            check=True,
-            stdout=subprocess.PIPE,
-            encoding="utf-8",
-        )
-
-        for num, line in enumerate(p.stdout.splitlines()):
-            assert (
-                re.search(r"\s+$", line) is None
-            ), f"Line {num + 1} has trailing whitespace"
-
-    def test_tabs(self, args, expect):
-        """
-        Tests that the output file doesn't contain tabs
-        """
-        p = subprocess.run(
-            [
-                "shacl2code",
-                "generate",
-            ]
-            + args
-            + [
-                "jsonschema",
-                "--output",
-                "-",
-            ],
-            check=True,
-            stdout=subprocess.PIPE,
-            encoding="utf-8",
-        )
-
-        for num, line in enumerate(p.stdout.splitlines()):
-            assert "\t" not in line, f"Line {num + 1} has tabs"
+        check_whitespace(generated)
 
 
 @jsonvalidation.validation_tests()
@@ -15,6 +15,7 @@ import sys
 import importlib
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
+from whitespace import check_whitespace
 
 THIS_FILE = Path(__file__)
 THIS_DIR = THIS_FILE.parent
@@ -74,6 +75,29 @@ def model(test_context):
         sys.path = old_path
 
 
+@pytest.fixture(scope="class")
+def generated(args):
+    """
+    Python code generated once for each set of TestOutput arguments
+    """
+    p = subprocess.run(
+        [
+            "shacl2code",
+            "generate",
+        ]
+        + args
+        + [
+            "python",
+            "--output",
+            "-",
+        ],
+        check=True,
+        stdout=subprocess.PIPE,
+        encoding="utf-8",
+    )
+    yield p.stdout
+
+
 @pytest.mark.parametrize(
     "args,expect",
     [
@@ -86,6 +110,7 @@ def model(test_context):
             EXPECT_DIR / "python" / "context" / "test-context.py",
         ),
     ],
+    scope="class",
 )
 class TestOutput:
     def test_generation(self, tmp_path, args, expect):
@@ -133,53 +158,11 @@ class TestOutput:
 
         subprocess.run([sys.executable, outfile, "--help"], check=True)
 
-    def test_trailing_whitespace(self, args, expect):
+    def test_whitespace(self, generated, expect):
         """
-        Tests that the generated file does not have trailing whitespace
+        Tests that the generated file does not have trailing whitespace or tabs
         """
-        p = subprocess.run(
-            [
-                "shacl2code",
-                "generate",
-            ]
-            + args
-            + [
-                "python",
-                "--output",
-                "-",
-            ],
-            check=True,
-            stdout=subprocess.PIPE,
-            encoding="utf-8",
-        )
-
-        for num, line in enumerate(p.stdout.splitlines()):
-            assert (
-                re.search(r"\s+$", line) is None
-            ), f"Line {num + 1} has trailing whitespace"
-
-    def test_tabs(self, args, expect):
-        """
-        Tests that the output file doesn't contain tabs
-        """
-        p = subprocess.run(
-            [
-                "shacl2code",
-                "generate",
-            ]
-            + args
-            + [
-                "python",
-                "--output",
-                "-",
-            ],
-            check=True,
-            stdout=subprocess.PIPE,
-            encoding="utf-8",
-        )
-
-        for num, line in enumerate(p.stdout.splitlines()):
-            assert "\t" not in line, f"Line {num + 1} has tabs"
+        check_whitespace(generated)
 
 
 def test_roundtrip(model, tmp_path, roundtrip):